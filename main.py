@@ -1,8 +1,21 @@
 import os
-from PIL import Image
+import sys
+from PIL import Image, ImageChops
 import collections
+import hashlib
+import io
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import tempfile
 import re  # Import regular expressions for more robust parsing
 
+try:
+    import numpy as np
+except ImportError:  # Fall back to Pillow's raw buffers when NumPy is unavailable
+    np = None
+
 # --- Configuration ---
 INPUT_DIR = "./input"
 OUTPUT_DIR = "./output"
@@ -33,83 +46,262 @@ AVAILABLE_CHARS = (
     + [c for c in "abcdefghijklmnopqrstuvwxyz" if c not in DEFAULT_PALETTE_JAVA]
     + [str(i) for i in range(10)]
 )
+# Below this many pixels across the distinct images, rendering in-process beats
+# starting a process pool
+PARALLEL_RENDER_MIN_PIXELS = 1 << 20
+# Below this many pixels, importing and loading the Numba kernel costs more than it saves
+NUMBA_RENDER_MIN_PIXELS = 1 << 26
+# Palettes up to this size are looked up through a small perfect hash instead of a binary search
+SPARSE_PALETTE_MAX_COLORS = 64
+HASH_TABLE_MAX_SIZE = 1 << 12
+# Color frequencies are scaled down to at most about this many pixels before median cut
+QUANTIZE_SAMPLE_MAX_PIXELS = 1 << 20
+# Colors matched to their nearest palette entry per batch, bounding the distance array
+NEAREST_COLOR_CHUNK = 1 << 16
+# Below this decoded RGBA size, images stay in memory instead of being spilled to .npy files
+DECODED_CACHE_MIN_BYTES = 1 << 28
+# File extensions picked up from the input directory
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff"}
 # Category for images without a clear category_ prefix
 DEFAULT_CATEGORY = "General"
+# Splits filenames into text and number runs for natural sorting
+_NUM_RE = re.compile(r"(\d+)")
+# Replaces non-identifier characters and prefixes names that are empty or start with a digit
+_VAR_RE = re.compile(r"\W|^(?=\d|$)")
 
 # --- Helper Functions (ensure_dir, get_image_files, analyze_colors, create_color_map, generate_palette_file - mostly unchanged from uploaded script) ---
 
 
 def ensure_dir(directory):
     """Creates the directory if it doesn't exist."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
 
 
 def natural_sort_key(s):
     """Sort helper that handles embedded numbers in strings naturally."""
-    return [
-        int(text) if text.isdigit() else text.lower() for text in re.split(r"(\d+)", s)
-    ]
+    return [int(text) if text.isdigit() else text.lower() for text in _NUM_RE.split(s)]
 
 
 def get_image_files(directory):
-    """Gets a list of image filenames from the input directory."""
-    files = []
-    if not os.path.isdir(directory):
+    """Gets a list of image paths from the input directory."""
+    directory = Path(directory)
+    if not directory.is_dir():
         print(f"Error: Input directory '{directory}' not found.")
-        return files
-    for filename in os.listdir(directory):
-        if filename.lower().endswith(
-            (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff")
-        ):
-            files.append(os.path.join(directory, filename))
+        return []
+    files = [p for p in directory.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS]
     # Natural sort files for consistent, human-friendly order in generated Java file
-    files.sort(key=lambda x: natural_sort_key(os.path.basename(x)))
+    files.sort(key=lambda p: natural_sort_key(p.name))
     return files
 
 
-def analyze_colors(image_files):
-    """Analyzes images to find unique opaque colors."""
-    unique_colors = set()
+def pack_rgb(arr):
+    """Packs the RGB channels of an (..., 4) uint8 array into uint32 0xRRGGBB values."""
+    return (
+        (arr[..., 0].astype(np.uint32) << 16)
+        | (arr[..., 1].astype(np.uint32) << 8)
+        | arr[..., 2].astype(np.uint32)
+    )
+
+
+def unpack_rgb(packed):
+    """Unpacks a 0xRRGGBB integer into an (r, g, b) tuple."""
+    return ((packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF)
+
+
+def rgba_words(img):
+    """Reads an RGBA Pillow image in one bulk copy as a sequence of native-endian 32-bit pixels."""
+    return memoryview(img.tobytes()).cast("I")
+
+
+def unpack_word(word):
+    """Splits a 32-bit pixel from rgba_words into an (r, g, b, a) tuple."""
+    return tuple(word.to_bytes(4, sys.byteorder))
+
+
+def to_rgba_array(img):
+    """Returns the pixels of a Pillow image as an (H, W, 4) uint8 RGBA array.
+
+    RGBA images are read as is and RGB images without a transparency color key get an
+    opaque alpha channel in NumPy, skipping the intermediate image Pillow's
+    convert("RGBA") would allocate.
+    """
+    if img.mode == "RGBA":
+        return np.asarray(img, dtype=np.uint8)
+    if img.mode == "RGB" and "transparency" not in img.info:
+        rgb = np.asarray(img, dtype=np.uint8)
+        arr = np.empty(rgb.shape[:2] + (4,), dtype=np.uint8)
+        arr[..., :3] = rgb
+        arr[..., 3] = 255
+        return arr
+    # Color-keyed RGB, palette (possibly with transparency), grayscale etc. go through Pillow
+    return np.asarray(img.convert("RGBA"), dtype=np.uint8)
+
+
+def _decode(filepath, cache_path=None):
+    """Decodes a single image into an RGBA array (None if it could not be read).
+
+    With a cache_path the array is written there as .npy and a read-only memory map of it is
+    returned, so decoded pixels live in the page cache instead of the process heap.
+    Without NumPy the converted RGBA Pillow image is returned instead.
+    """
+    try:
+        with Image.open(filepath) as img:
+            if np is None:
+                return filepath, img.convert("RGBA")
+            arr = to_rgba_array(img)
+    except Exception as e:
+        print(f"Error loading {filepath}: {e}")
+        return filepath, None
+    if cache_path is None:
+        return filepath, arr
+    np.save(cache_path, arr)
+    return filepath, np.asarray(np.load(cache_path, mmap_mode="r"))
+
+
+def decoded_size(image_files):
+    """Estimates the decoded RGBA size of the images in bytes from their headers alone."""
+    total = 0
     for filepath in image_files:
         try:
             with Image.open(filepath) as img:
-                img = img.convert("RGBA")
-                width, height = img.size
-                pixels = img.load()
-                for y in range(height):
-                    for x in range(width):
-                        r, g, b, a = pixels[x, y]
-                        if a > 0:
-                            unique_colors.add((r, g, b))
-        except Exception as e:
-            print(f"Error processing colors in {filepath}: {e}")
+                total += 4 * math.prod(img.size)
+        except Exception:  # Unreadable files are reported when they are decoded
+            pass
+    return total
+
+
+def load_all_images(image_files, cache_dir=None):
+    """Decodes each image once into an RGBA array, keyed by path (None if it could not be read).
+
+    If cache_dir is given, decoded arrays are spilled there and memory-mapped, so the pixels
+    need not stay resident between passes while each file is still decoded only once.
+    """
+    if cache_dir is None or np is None:
+        cache_paths = itertools.repeat(None)
+    else:
+        cache_paths = [Path(cache_dir) / f"{i}.npy" for i in range(len(image_files))]
+    # Pillow releases the GIL while decoding, so threads scale across cores
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return dict(executor.map(_decode, image_files, cache_paths))
+
+
+def analyze_colors(images):
+    """Analyzes decoded images to find unique opaque colors, as packed 0xRRGGBB ints."""
+    unique_colors = set()
+    per_file_unique = []
+    for arr in images.values():
+        if arr is None:
+            continue
+        if np is None:
+            for word in set(rgba_words(arr)):
+                r, g, b, a = unpack_word(word)
+                if a > 0:
+                    unique_colors.add((r << 16) | (g << 8) | b)
+            continue
+        per_file_unique.append(np.unique(pack_rgb(arr)[arr[..., 3] > 0]))
+    if per_file_unique:
+        # Each file's palette is small, so one merge at the end beats per-file set updates
+        unique_colors.update(np.unique(np.concatenate(per_file_unique)).tolist())
     return unique_colors
 
 
-def create_color_map(unique_colors):
-    """Creates a mapping from RGB color tuples to characters."""
+def quantize_colors(colors, images, max_colors):
+    """Reduces colors to a median-cut palette of at most max_colors entries.
+
+    Returns a mapping of each color to its nearest palette color. With NumPy the palette is
+    weighted by how often each color occurs across the decoded images; the counts are
+    gathered one image at a time and scaled to a bounded sample, so memory use does not
+    grow with the total pixel count.
+    """
+    colors = sorted(colors)
+    if np is None:
+        sample = Image.new("RGB", (len(colors), 1))
+        sample.putdata([unpack_rgb(c) for c in colors])
+    else:
+        wanted = np.array(colors, dtype=np.uint32)
+        counts = np.zeros(len(wanted), dtype=np.int64)
+        for arr in images.values():
+            if arr is None:
+                continue
+            found, found_counts = np.unique(
+                pack_rgb(arr)[arr[..., 3] > 0], return_counts=True
+            )
+            idx = np.minimum(np.searchsorted(wanted, found), len(wanted) - 1)
+            hit = wanted[idx] == found
+            counts[idx[hit]] += found_counts[hit]
+        total = int(counts.sum())
+        if total > QUANTIZE_SAMPLE_MAX_PIXELS:
+            # Keep every color in the sample, however rare
+            counts = np.maximum(counts * QUANTIZE_SAMPLE_MAX_PIXELS // total, 1)
+        packed = np.repeat(wanted, counts)
+        rgb = np.stack(unpack_rgb(packed), axis=-1).astype(np.uint8)
+        sample = Image.fromarray(rgb[np.newaxis], "RGB")
+    quantized = sample.quantize(colors=max_colors, method=Image.Quantize.MEDIANCUT)
+    flat_palette = quantized.getpalette()
+    palette = [
+        tuple(flat_palette[3 * index : 3 * index + 3])
+        for _, index in quantized.getcolors(max_colors)
+    ]
+    if np is None:
+        nearest = [
+            min(
+                palette,
+                key=lambda p: sum((x - y) ** 2 for x, y in zip(p, unpack_rgb(color))),
+            )
+            for color in colors
+        ]
+        return {
+            color: (r << 16) | (g << 8) | b for color, (r, g, b) in zip(colors, nearest)
+        }
+    rgb = np.stack(unpack_rgb(wanted), axis=-1).astype(np.int32)
+    palette_rgb = np.array(palette, dtype=np.int32)
+    # |c - p|^2 = |c|^2 - 2 c.p + |p|^2, and |c|^2 doesn't change which p is nearest
+    weights = -2 * palette_rgb.T
+    offsets = (palette_rgb**2).sum(axis=1)
+    nearest = np.empty(len(wanted), dtype=np.intp)
+    for start in range(0, len(wanted), NEAREST_COLOR_CHUNK):
+        chunk = rgb[start : start + NEAREST_COLOR_CHUNK]
+        nearest[start : start + len(chunk)] = (chunk @ weights + offsets).argmin(axis=1)
+    palette_packed = pack_rgb(palette_rgb)
+    return dict(zip(colors, palette_packed[nearest].tolist()))
+
+
+def create_color_map(unique_colors, images=None):
+    """Creates a mapping from packed 0xRRGGBB colors to characters.
+
+    If there are more colors than characters and the decoded images are given, the colors
+    without a default character are quantized to fit instead of falling back to '?'.
+    """
     color_to_char = {}
     char_to_color = {}
     char_pool = collections.deque(AVAILABLE_CHARS)
     used_default_chars = set()
-    colors_to_process = list(unique_colors)
+    default_color_to_char = {
+        (r << 16) | (g << 8) | b: char
+        for char, (r, g, b) in DEFAULT_PALETTE_JAVA.items()
+    }
 
     # Try mapping default colors first
-    for rgb in list(colors_to_process):  # Iterate over a copy
-        found_default = False
-        for char, default_rgb in DEFAULT_PALETTE_JAVA.items():
-            if rgb == default_rgb:
-                if char not in used_default_chars:
-                    color_to_char[rgb] = char
-                    char_to_color[char] = rgb
-                    used_default_chars.add(char)
-                    unique_colors.remove(rgb)
-                    colors_to_process.remove(rgb)  # Remove from processing list too
-                    found_default = True
-                    break
-        if found_default:
-            continue
+    for color in list(unique_colors):  # Iterate over a copy
+        char = default_color_to_char.get(color)
+        if char and char not in used_default_chars:
+            color_to_char[color] = char
+            char_to_color[char] = color
+            used_default_chars.add(char)
+            unique_colors.discard(color)
+
+    if images is not None and len(unique_colors) > len(char_pool):
+        representatives = quantize_colors(unique_colors, images, len(char_pool))
+        palette = sorted(set(representatives.values()))
+        print(
+            f"Reduced {len(unique_colors)} colors to {len(palette)} with median cut quantization."
+        )
+        palette_to_char = dict(zip(palette, char_pool))
+        for char_color, char in palette_to_char.items():
+            char_to_color[char] = char_color
+        for color, char_color in representatives.items():
+            color_to_char[color] = palette_to_char[char_color]
+        unique_colors = set()
 
     # Assign remaining unique colors
     for color in sorted(list(unique_colors)):
@@ -141,7 +333,7 @@ def generate_palette_file(char_to_color_map, output_path):
             for char, color in sorted(char_to_color_map.items()):
                 is_default = char in DEFAULT_PALETTE_JAVA
                 if not is_default:
-                    r, g, b = color
+                    r, g, b = unpack_rgb(color)
                     java_char = f"'{char}'" if char != "'" else "'\\''"
                     java_char = java_char if char != "\\" else "'\\\\'"
                     f.write(
@@ -152,30 +344,231 @@ def generate_palette_file(char_to_color_map, output_path):
         print(f"Error writing palette file {output_path}: {e}")
 
 
-def image_to_block_string(image_path, color_map):
-    """Converts an image file to a Java BlockImage string (unchanged except for trailing space removal)."""
-    block_lines = []
+def build_char_lut(color_map):
+    """Builds (keys, vals, modulus) arrays mapping packed RGB to the characters' ASCII codes.
+
+    Small palettes are stored in a collision-free hash table indexed by packed % modulus;
+    otherwise keys are sorted for binary search and modulus is None. Without NumPy a
+    (packed RGB -> character dict, palette image, translate table) tuple is returned
+    instead, see build_palette_lut.
+    """
+    if np is None:
+        return build_palette_lut(color_map)
+    keys = np.array(sorted(color_map), dtype=np.uint32)
+    vals = np.array([ord(color_map[k]) for k in keys.tolist()], dtype=np.uint8)
+    modulus = (
+        find_hash_modulus(keys) if len(keys) <= SPARSE_PALETTE_MAX_COLORS else None
+    )
+    if modulus is None:
+        return keys, vals, None
+    slots = keys % modulus
+    # Empty slots keep key 0 and value 0, which still reads as "unmapped"
+    table_keys = np.zeros(modulus, dtype=np.uint32)
+    table_vals = np.zeros(modulus, dtype=np.uint8)
+    table_keys[slots] = keys
+    table_vals[slots] = vals
+    return table_keys, table_vals, np.uint32(modulus)
+
+
+def find_hash_modulus(keys):
+    """Finds the smallest modulus that maps every key to its own slot.
+
+    Returns None if no such modulus exists up to HASH_TABLE_MAX_SIZE.
+    """
+    if not len(keys):
+        return None
+    candidates = np.arange(len(keys), HASH_TABLE_MAX_SIZE + 1, dtype=np.uint32)
+    slots = np.sort(keys[:, np.newaxis] % candidates, axis=0)
+    collision_free = (np.diff(slots, axis=0) != 0).all(axis=0)
+    if not collision_free.any():
+        return None
+    return int(candidates[collision_free.argmax()])
+
+
+def build_palette_lut(packed_to_char):
+    """Builds a Pillow palette of the mapped colors plus a bytes.translate table from palette index to character.
+
+    The entry after the mapped colors is a sentinel color (not in the map) standing in for transparent
+    pixels; unused entries repeat it. Palette image and table are None if the map doesn't fit in 255 entries.
+    """
+    if len(packed_to_char) > 255:
+        return packed_to_char, None, None
+    mapped_rgb = [unpack_rgb(c) for c in packed_to_char]
+
+    def distance_to_mapped(candidate):
+        return min(
+            (sum((x - y) ** 2 for x, y in zip(candidate, rgb)) for rgb in mapped_rgb),
+            default=1,
+        )
+
+    # Keep the sentinel as far as possible from every mapped color
+    sentinel_rgb = max(
+        itertools.product((0, 85, 170, 255), repeat=3), key=distance_to_mapped
+    )
+    if distance_to_mapped(sentinel_rgb) == 0:
+        return packed_to_char, None, None
+    r, g, b = sentinel_rgb
+    sentinel = (r << 16) | (g << 8) | b
+    packed_colors = list(packed_to_char) + [sentinel] * (256 - len(packed_to_char))
+    palette_image = Image.new("P", (1, 1))
+    palette_image.putpalette(
+        [channel for c in packed_colors for channel in unpack_rgb(c)]
+    )
+    table = bytes(ord(packed_to_char.get(c, " ")) for c in packed_colors)
+    return packed_to_char, palette_image, table
+
+
+def lookup_chars(packed, char_lut):
+    """Maps packed RGB values to ASCII codes via hash table or binary search; unmapped colors yield 0."""
+    keys, vals, modulus = char_lut
+    if modulus is not None:
+        slots = packed % modulus
+        return np.where(keys[slots] == packed, vals[slots], 0).astype(
+            np.uint8, copy=False
+        )
+    if not len(keys):
+        return np.zeros(packed.shape, dtype=np.uint8)
+    idx = np.minimum(np.searchsorted(keys, packed), len(keys) - 1)
+    return np.where(keys[idx] == packed, vals[idx], 0).astype(np.uint8, copy=False)
+
+
+_render_kernel = None
+
+
+def load_render_kernel():
+    """Imports Numba and compiles (or loads from cache) the fused render kernel on first use.
+
+    Returns None if Numba is not installed.
+    """
+    global _render_kernel
+    if _render_kernel is not None:
+        return _render_kernel
     try:
-        with Image.open(image_path) as img:
-            img = img.convert("RGBA")
-            width, height = img.size
-            pixels = img.load()
-            for y in range(height):
-                line = ""
-                for x in range(width):
-                    r, g, b, a = pixels[x, y]
-                    if a == 0:
-                        line += " "
-                    else:
-                        char = color_map.get((r, g, b))
-                        if char:
-                            line += char
-                        else:
-                            print(
-                                f"Warning: Color ({r},{g},{b}) alpha {a} not in map for {image_path}. Using '?'."
-                            )
-                            line += "?"
-                block_lines.append(line)
+        from numba import njit, prange
+    except ImportError:  # The fused render kernel is optional, NumPy alone works fine
+        return None
+
+    @njit(parallel=True, cache=True)
+    def render_kernel(arr, keys, vals, modulus, out):
+        """Packs, hashes and masks every pixel in one pass, writing ASCII codes into out.
+
+        Transparent pixels become spaces, unmapped colors 0 and the extra last column
+        of each row a newline.
+        """
+        height, width = arr.shape[0], arr.shape[1]
+        for y in prange(height):
+            for x in range(width):
+                if arr[y, x, 3] == 0:
+                    out[y, x] = 32
+                    continue
+                packed = (
+                    (np.uint32(arr[y, x, 0]) << 16)
+                    | (np.uint32(arr[y, x, 1]) << 8)
+                    | np.uint32(arr[y, x, 2])
+                )
+                slot = packed % modulus
+                out[y, x] = vals[slot] if keys[slot] == packed else 0
+            out[y, width] = 10
+
+    _render_kernel = render_kernel
+    return _render_kernel
+
+
+def _block_lines_numpy(arr, char_lut, image_path, kernel=None):
+    """Renders the rows of an RGBA array with vectorized palette lookups.
+
+    If the hash-table kernel from load_render_kernel is given, the lookups run fused in it.
+    """
+    height, width = arr.shape[:2]
+    # Append a newline column so the whole image decodes in a single call
+    text = np.empty((height, width + 1), dtype=np.uint8)
+    chars = text[:, :width]
+    if kernel is not None:
+        keys, vals, modulus = char_lut
+        kernel(arr, keys, vals, modulus, text)
+        missing = chars == 0
+    else:
+        packed = pack_rgb(arr)
+        chars[...] = lookup_chars(packed, char_lut)
+        opaque = arr[..., 3] != 0
+        missing = opaque & (chars == 0)
+        chars[~opaque] = ord(" ")
+        text[:, width] = ord("\n")
+    if missing.any():
+        for color in np.unique(pack_rgb(arr)[missing]).tolist():
+            r, g, b = unpack_rgb(color)
+            print(
+                f"Warning: Color ({r},{g},{b}) not in map for {image_path}. Using '?'."
+            )
+        chars[missing] = ord("?")
+    return text.tobytes().decode("ascii").split("\n")[:-1]
+
+
+def _block_lines_python(img, char_lut, image_path):
+    """Renders the rows of an RGBA Pillow image without NumPy.
+
+    Each distinct pixel is resolved once; if every opaque color is mapped and the palette fits,
+    the image is remapped to palette indices by Pillow and translated to characters in one call.
+    Otherwise (or if the remap is inexact) the raw buffer is mapped through a dict.
+    """
+    packed_to_char, palette_image, table = char_lut
+    width, height = img.size
+    words = rgba_words(img)
+    word_to_char = {}
+    all_mapped = True
+    for word in set(words):
+        r, g, b, a = unpack_word(word)
+        if a == 0:
+            word_to_char[word] = " "
+            continue
+        char = packed_to_char.get((r << 16) | (g << 8) | b)
+        if not char:
+            print(
+                f"Warning: Color ({r},{g},{b}) not in map for {image_path}. Using '?'."
+            )
+            char = "?"
+            all_mapped = False
+        word_to_char[word] = char
+    if all_mapped and palette_image is not None:
+        # Paint transparent pixels in the sentinel color, which translates to a space
+        rgb = Image.new("RGB", img.size, tuple(palette_image.getpalette()[-3:]))
+        rgb.paste(
+            img.convert("RGB"),
+            (0, 0),
+            img.getchannel("A").point(lambda a: 255 if a else 0),
+        )
+        indexed = rgb.quantize(palette=palette_image, dither=Image.Dither.NONE)
+        # Pillow's palette cache is coarser than 8 bits per channel, so near-identical
+        # colors can land on the wrong entry; only trust the remap if it round-trips exactly
+        if ImageChops.difference(indexed.convert("RGB"), rgb).getbbox() is None:
+            text = indexed.tobytes().translate(table).decode("ascii")
+            return [text[y * width : (y + 1) * width] for y in range(height)]
+    return [
+        "".join(map(word_to_char.__getitem__, words[y * width : (y + 1) * width]))
+        for y in range(height)
+    ]
+
+
+def image_content_key(arr):
+    """Hashes a decoded image's size and RGBA bytes, so identical tiles share one key."""
+    if np is None:
+        size, data = arr.size, arr.tobytes()
+    else:
+        size, data = arr.shape, np.ascontiguousarray(arr)
+    digest = hashlib.blake2b(data, digest_size=16)
+    digest.update(repr(size).encode("ascii"))
+    return digest.digest()
+
+
+def image_to_block_string(arr, char_lut, image_path, kernel=None):
+    """Converts a decoded RGBA image to a Java BlockImage string, trimming trailing spaces."""
+    if arr is None:
+        return '"""\nError\n"""'
+    try:
+        if np is None:
+            block_lines = _block_lines_python(arr, char_lut, image_path)
+        else:
+            block_lines = _block_lines_numpy(arr, char_lut, image_path, kernel)
         # Remove trailing spaces from each line
         trimmed_lines = [line.rstrip() for line in block_lines]
         java_string = '"""\n' + "\n".join(trimmed_lines) + '\n"""'
@@ -185,21 +578,94 @@ def image_to_block_string(image_path, color_map):
         return '"""\nError\n"""'
 
 
+_worker_char_lut = None
+_worker_kernel = None
+
+
+def _init_render_worker(char_lut, use_kernel):
+    """Stores the palette lookup (and loads the kernel) once per worker process instead of once per task."""
+    global _worker_char_lut, _worker_kernel
+    _worker_char_lut = char_lut
+    _worker_kernel = load_render_kernel() if use_kernel else None
+    if _worker_kernel is not None:
+        import numba
+
+        # The pool already keeps every core busy, so each worker's kernel runs on one thread
+        numba.set_num_threads(1)
+
+
+def _render_worker(item):
+    """Renders one (image, path) pair in a worker process."""
+    arr, image_path = item
+    return image_to_block_string(arr, _worker_char_lut, image_path, _worker_kernel)
+
+
+def render_block_strings(images, char_lut):
+    """Renders every decoded image to its Java BlockImage string, keyed by path.
+
+    Images with identical content are rendered once. Large batches are spread over a
+    process pool, since each conversion only depends on its image and the palette lookup,
+    and very large ones with a hash-table palette use the Numba kernel if it is installed.
+    """
+    content_keys = {
+        path: image_content_key(arr) for path, arr in images.items() if arr is not None
+    }
+    distinct = {}
+    for path, key in content_keys.items():
+        distinct.setdefault(key, (images[path], path))
+    total_pixels = sum(
+        math.prod(arr.size if np is None else arr.shape[:2])
+        for arr, _ in distinct.values()
+    )
+    # The kernel only beats NumPy for hash-table lookups, and only once the pixels
+    # outweigh the Numba import
+    use_kernel = (
+        np is not None
+        and char_lut[2] is not None
+        and total_pixels >= NUMBA_RENDER_MIN_PIXELS
+    )
+    if (
+        (os.cpu_count() or 1) > 1
+        and len(distinct) > 1
+        and total_pixels >= PARALLEL_RENDER_MIN_PIXELS
+    ):
+        with ProcessPoolExecutor(
+            initializer=_init_render_worker, initargs=(char_lut, use_kernel)
+        ) as executor:
+            rendered = dict(
+                zip(distinct, executor.map(_render_worker, distinct.values()))
+            )
+    else:
+        kernel = load_render_kernel() if use_kernel else None
+        rendered = {
+            key: image_to_block_string(arr, char_lut, path, kernel)
+            for key, (arr, path) in distinct.items()
+        }
+    return {
+        path: (
+            rendered[content_keys[path]]
+            if path in content_keys
+            else image_to_block_string(None, char_lut, path)
+        )
+        for path in images
+    }
+
+
 def generate_java_file(
-    image_files, color_map, output_path, grouping_mode, group_output_type
+    images, color_map, output_path, grouping_mode, group_output_type
 ):
     """
     Generates the GameBlockImages.java file according to user options.
+    images: mapping of image path -> decoded RGBA array, as returned by load_all_images
     grouping_mode: 'grouped' or 'flat'
     group_output_type: 'class' or 'enum' (only relevant if grouping_mode == 'grouped')
     """
     import collections
-    import re
 
     categorized_images = collections.defaultdict(list)
-    for image_path in image_files:
-        filename = os.path.basename(image_path)
-        name_without_ext = os.path.splitext(filename)[0]
+    for image_path in images:
+        filename = image_path.name
+        name_without_ext = image_path.stem
         parts = name_without_ext.split("_", 1)
         if grouping_mode == "grouped" and len(parts) == 2:
             category_name = parts[0].capitalize()
@@ -207,16 +673,19 @@ def generate_java_file(
         else:
             category_name = "General"
             image_name = name_without_ext
-        variable_name = re.sub(r"\W|^(?=\d)", "_", image_name).upper()
-        if not variable_name or not (
-            variable_name[0].isalpha() or variable_name[0] == "_"
-        ):
-            variable_name = "_" + variable_name
+        variable_name = _VAR_RE.sub("_", image_name).upper()
         categorized_images[category_name].append(
-            {"path": image_path, "filename": filename, "variable_name": variable_name}
+            {
+                "path": image_path,
+                "filename": filename,
+                "variable_name": variable_name,
+                "sort_key": natural_sort_key(filename),
+            }
         )
     try:
-        with open(output_path, "w") as f:
+        block_strings = render_block_strings(images, build_char_lut(color_map))
+        # Stage the whole file in memory and write it out with a single call
+        with io.StringIO() as f:
             f.write("package thd.gameobjects.movable;\n\n")
             f.write("public class GameBlockImages {\n\n")
             f.write("    private GameBlockImages() {}\n\n")
@@ -224,12 +693,8 @@ def generate_java_file(
             if grouping_mode == "flat":
                 for group in categorized_images.values():
                     # Natural sort within group
-                    for img_info in sorted(
-                        group, key=lambda x: natural_sort_key(x["filename"])
-                    ):
-                        block_string = image_to_block_string(
-                            img_info["path"], color_map
-                        )
+                    for img_info in sorted(group, key=lambda x: x["sort_key"]):
+                        block_string = block_strings[img_info["path"]]
                         f.write(
                             f"    static final String {img_info['variable_name']} = {block_string};\n\n"
                         )
@@ -239,25 +704,17 @@ def generate_java_file(
                     if group_output_type == "class":
                         f.write(f"    static class {category} {{\n\n")
                         f.write(f"        private {category}() {{}}\n\n")
-                        for img_info in sorted(
-                            group, key=lambda x: natural_sort_key(x["filename"])
-                        ):
-                            block_string = image_to_block_string(
-                                img_info["path"], color_map
-                            )
+                        for img_info in sorted(group, key=lambda x: x["sort_key"]):
+                            block_string = block_strings[img_info["path"]]
                             f.write(
                                 f"        static final String {img_info['variable_name']} = {block_string};\n\n"
                             )
                         f.write("    }\n\n")
                     elif group_output_type == "enum":
                         f.write(f"    enum {category}Tiles {{\n")
-                        sorted_group = sorted(
-                            group, key=lambda x: natural_sort_key(x["filename"])
-                        )
+                        sorted_group = sorted(group, key=lambda x: x["sort_key"])
                         for i, img_info in enumerate(sorted_group):
-                            block_string = image_to_block_string(
-                                img_info["path"], color_map
-                            )
+                            block_string = block_strings[img_info["path"]]
                             comma = "," if i < len(sorted_group) - 1 else ";"
                             f.write(
                                 f"        {img_info['variable_name']}({block_string}){comma}\n"
@@ -269,6 +726,8 @@ def generate_java_file(
                         f.write("        String blockImage() { return tile; }\n")
                         f.write("    }\n\n")
             f.write("}\n")
+            with open(output_path, "w") as out:
+                out.write(f.getvalue())
         print(f"Generated Java block images file: {output_path}")
     except Exception as e:
         print(f"Error writing Java file {output_path}: {e}")
@@ -285,50 +744,71 @@ if __name__ == "__main__":
     else:
         print(f"Found {len(image_files)} image files.")
 
-        print("Analyzing colors across all images...")
-        all_unique_colors = analyze_colors(image_files)
-        print(f"Found {len(all_unique_colors)} unique opaque colors.")
+        print("Loading images...")
+        # Large inputs are memory-mapped from here between the analysis and output passes
+        decoded_cache = None
+        if np is not None and decoded_size(image_files) >= DECODED_CACHE_MIN_BYTES:
+            decoded_cache = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        images = {}
+        try:
+            images = load_all_images(
+                image_files, None if decoded_cache is None else decoded_cache.name
+            )
 
-        color_to_char_map, char_to_color_map = create_color_map(
-            all_unique_colors.copy()
-        )
+            print("Analyzing colors across all images...")
+            all_unique_colors = analyze_colors(images)
+            print(f"Found {len(all_unique_colors)} unique opaque colors.")
+
+            color_to_char_map, char_to_color_map = create_color_map(
+                all_unique_colors.copy(), images
+            )
 
-        palette_path = os.path.join(OUTPUT_DIR, "ColorPalettes.txt")
-        generate_palette_file(char_to_color_map, palette_path)
-
-        print("\nHow do you want to organize the output Java class?")
-        print("1. Group images by prefix (sub-classes/enums, e.g. CarTiles.ROT_0)")
-        print("2. All images as static final Strings in one class")
-        while True:
-            choice1 = input("Enter 1 or 2: ").strip()
-            if choice1 in ("1", "2"):
-                break
-        if choice1 == "1":
-            print("\nHow should each group be represented?")
-            print("1. As static inner classes (each image as static final String)")
-            print("2. As enums (each image as an enum constant with the image string)")
+            palette_path = Path(OUTPUT_DIR) / "ColorPalettes.txt"
+            generate_palette_file(char_to_color_map, palette_path)
+
+            print("\nHow do you want to organize the output Java class?")
+            print("1. Group images by prefix (sub-classes/enums, e.g. CarTiles.ROT_0)")
+            print("2. All images as static final Strings in one class")
             while True:
-                choice2 = input("Enter 1 or 2: ").strip()
-                if choice2 in ("1", "2"):
+                choice1 = input("Enter 1 or 2: ").strip()
+                if choice1 in ("1", "2"):
                     break
-            group_output_type = "class" if choice2 == "1" else "enum"
-            grouping_mode = "grouped"
-        else:
-            grouping_mode = "flat"
-            group_output_type = None
-
-        java_path = os.path.join(OUTPUT_DIR, "GameBlockImages.java")
-        generate_java_file(
-            image_files, color_to_char_map, java_path, grouping_mode, group_output_type
-        )
+            if choice1 == "1":
+                print("\nHow should each group be represented?")
+                print("1. As static inner classes (each image as static final String)")
+                print(
+                    "2. As enums (each image as an enum constant with the image string)"
+                )
+                while True:
+                    choice2 = input("Enter 1 or 2: ").strip()
+                    if choice2 in ("1", "2"):
+                        break
+                group_output_type = "class" if choice2 == "1" else "enum"
+                grouping_mode = "grouped"
+            else:
+                grouping_mode = "flat"
+                group_output_type = None
+
+            java_path = Path(OUTPUT_DIR) / "GameBlockImages.java"
+            generate_java_file(
+                images, color_to_char_map, java_path, grouping_mode, group_output_type
+            )
+        finally:
+            # Drop the memory maps before removing the files behind them, even on errors
+            images.clear()
+            if decoded_cache is not None:
+                decoded_cache.cleanup()
 
         print("\nConversion complete.")
         print(f"Output files generated in: {OUTPUT_DIR}")
-        print(f"  - {os.path.basename(java_path)}")
-        print(f"  - {os.path.basename(palette_path)}")
+        print(f"  - {java_path.name}")
+        print(f"  - {palette_path.name}")
         print("\n-------------------- Usage Instructions --------------------")
         print("1. Place `GameBlockImages.java` into the correct package folder.")
         print("2. Add code from `ColorPalettes.txt` to your GameView setup.")
         print("3. Access images as appropriate for your chosen format.")
         print("4. Ensure Pillow is installed (`pip install Pillow`).")
+        print(
+            "   NumPy is optional and speeds up conversion; Numba only helps huge batches."
+        )
         print("----------------------------------------------------------")